@@ -2,6 +2,16 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import io
+import os
+import xxhash
+import tempfile
+import re
+import uuid
+from collections import deque
+import xlsxwriter
+
+# Number of classified words to buffer before writing them into main_df
+FLUSH_EVERY = 25
 
 st.set_page_config(page_title="AAED Source Data Cleaner", layout="wide")
 
@@ -9,243 +19,438 @@ st.set_page_config(page_title="AAED Source Data Cleaner", layout="wide")
 st.title("AAED Source Data Cleaner")
 st.markdown("""
 This app helps identify and classify duplicate words in linguistic databases.
-1. Upload an Excel file containing word entries
+1. Upload an Excel (or Parquet) file containing word entries
 2. Review duplicated word forms one by one
 3. Classify them as either the same word or different homophones
 4. Download the updated Excel file with homophone classifications
 """)
 
 # Helper functions
+@st.cache_data(show_spinner=False, max_entries=8, ttl="1h")
+def load_excel(data):
+    """Parse uploaded Excel or Parquet bytes into a dataframe (cached per unique file content)"""
+    # Parquet exports from this app can be re-uploaded directly; drop any stored index so
+    # row labels stay unique and match row positions, as they do for Excel uploads
+    if data.startswith(b'PAR1'):
+        return pd.read_parquet(io.BytesIO(data)).reset_index(drop=True)
+    return pd.read_excel(io.BytesIO(data))
+
+@st.cache_data(show_spinner=False, max_entries=4, ttl="1h")
+def _cached_excel_bytes(_df, df_key):
+    """Serialize dataframe to Excel bytes; cached on df_key rather than hashing _df"""
+    output = io.BytesIO()
+    # constant_memory flushes each row as it is written, so rows must go out in order;
+    # pandas' to_excel writes column by column, hence the manual row loop
+    workbook = xlsxwriter.Workbook(output, {
+        'constant_memory': True,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+        'nan_inf_to_errors': True,
+    })
+    worksheet = workbook.add_worksheet()
+    # Same header style pandas' to_excel applies
+    header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+    worksheet.write_row(0, 0, [str(col) for col in _df.columns], header_format)
+    for row_num, row in enumerate(_df.itertuples(index=False, name=None), start=1):
+        worksheet.write_row(row_num, 0, [None if pd.isna(value) else value for value in row])
+    workbook.close()
+    return output.getvalue()
+
 def to_excel_bytes(df):
     """Convert dataframe to Excel bytes for download"""
+    df_key = (df.shape, int(pd.util.hash_pandas_object(df).sum()))
+    return _cached_excel_bytes(df, df_key)
+
+@st.cache_data(show_spinner=False, max_entries=4, ttl="1h")
+def _cached_parquet_bytes(_df, df_key):
+    """Serialize dataframe to Parquet bytes; cached on df_key rather than hashing _df"""
     output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False)
+    _df.to_parquet(output, compression='zstd', index=False)
     return output.getvalue()
 
+def to_parquet_bytes(df):
+    """Convert dataframe to Parquet bytes for download (much faster to write than Excel)"""
+    df_key = (df.shape, int(pd.util.hash_pandas_object(df).sum()))
+    return _cached_parquet_bytes(df, df_key)
+
+def progress_token():
+    """Token kept in the page URL that owns this reviewer's checkpoints; reopening the URL resumes them"""
+    token = st.query_params.get("progress")
+    if token is None or not re.fullmatch(r"[0-9a-f]{32}", token):
+        token = uuid.uuid4().hex
+        st.query_params["progress"] = token
+    return token
+
+def checkpoint_path(checkpoint_key):
+    """Location of the on-disk progress snapshot for an uploaded file and reviewer"""
+    return os.path.join(tempfile.gettempdir(), f"aaed_{checkpoint_key}.parquet")
+
+def pending_checkpoint_path(checkpoint_key):
+    """Location of the on-disk copy of a reviewer's classifications not yet flushed into the snapshot"""
+    return os.path.join(tempfile.gettempdir(), f"aaed_{checkpoint_key}.pending.parquet")
+
+def save_checkpoint(df, checkpoint_key):
+    """Snapshot classification progress to Parquet so it survives server restarts"""
+    _write_parquet(df, checkpoint_path(checkpoint_key))
+    # The snapshot now includes everything that was buffered
+    try:
+        os.remove(pending_checkpoint_path(checkpoint_key))
+    except FileNotFoundError:
+        pass
+
+def save_pending_checkpoint(pending, checkpoint_key):
+    """Persist the small buffer of unflushed classifications so a restart doesn't lose it"""
+    index, values = pending_arrays(pending)
+    _write_parquet(pd.DataFrame({'row': index, 'homophone': values}), pending_checkpoint_path(checkpoint_key))
+
+def _write_parquet(df, path):
+    """Write df to path as zstd Parquet, atomically"""
+    # Write to a unique temp file then rename, so an interrupted write never leaves a
+    # corrupt checkpoint and concurrent sessions never write to the same temp file
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), prefix=os.path.basename(path) + '_',
+                                     suffix='.tmp', delete=False) as tmp:
+        tmp_path = tmp.name
+    try:
+        df.to_parquet(tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def checkpoint_exists(checkpoint_key):
+    """Whether any saved progress exists on disk for an uploaded file and reviewer"""
+    return os.path.exists(checkpoint_path(checkpoint_key)) or os.path.exists(pending_checkpoint_path(checkpoint_key))
+
+def remove_checkpoint(checkpoint_key):
+    """Delete the on-disk progress snapshot and buffered classifications for an uploaded file and reviewer, if any"""
+    for path in [checkpoint_path(checkpoint_key), pending_checkpoint_path(checkpoint_key)]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def discard_checkpoint():
+    """Throw away restored progress and start the current file from scratch on the next run"""
+    remove_checkpoint(st.session_state.checkpoint_key)
+    st.session_state.pending_updates = []
+    del st.session_state.file_hash
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def build_display(_word_entries, entries_key):
+    """Build the entry table shown for a word; cached on entries_key rather than hashing _word_entries"""
+    display_df = _word_entries[['index', 'sub_index', 'entry', 'gloss']].copy()
+    display_df['index'] = display_df['index'].astype(str) + '-' + display_df['sub_index'].astype(str)
+    display_df = display_df.drop('sub_index', axis=1)
+    display_df.columns = ['Index', 'Entry', 'Gloss']
+    return display_df
+
+def queue_update(index, values):
+    """Buffer a homophone assignment; applied to main_df every FLUSH_EVERY words"""
+    st.session_state.pending_updates.append((index, values))
+    st.session_state.classified_count += len(index)
+    if len(st.session_state.pending_updates) >= FLUSH_EVERY:
+        flush_updates()
+    else:
+        save_pending_checkpoint(st.session_state.pending_updates, st.session_state.checkpoint_key)
+
+def pending_arrays(pending):
+    """Concatenate buffered (row labels, values) assignments into two flat arrays"""
+    index = np.concatenate([idx for idx, _ in pending])
+    values = np.concatenate([np.broadcast_to(np.asarray(v), len(idx)) for idx, v in pending])
+    return index, values
+
+def flush_updates():
+    """Apply all buffered homophone assignments in a single .loc call and checkpoint"""
+    pending = st.session_state.pending_updates
+    if not pending:
+        return
+    index, values = pending_arrays(pending)
+    st.session_state.main_df.loc[index, 'homophone'] = values
+    pending.clear()
+    save_checkpoint(st.session_state.main_df, st.session_state.checkpoint_key)
+
+def homophone_snapshot(df, pending):
+    """Copy of the homophone column with buffered assignments applied, taken on the script thread"""
+    homophone = df['homophone'].copy()
+    if pending:
+        index, values = pending_arrays(pending)
+        homophone.loc[index] = values
+    return homophone
+
+def export_frame(df, homophone):
+    """df with its homophone column replaced by a snapshot; only homophone is ever mutated after load,
+    so exports built off the script thread never read values a classify click is changing"""
+    return df.assign(homophone=homophone)
+
+def skip_word():
+    """Move the word at the head of the queue to the end"""
+    st.session_state.dup_queue.rotate(-1)
+
+@st.fragment
+def classify_panel():
+    """Review and classify the word at the head of the queue; widget clicks only rerun this panel"""
+    df = st.session_state.main_df
+    
+    # Get the first word that needs classification
+    current_word = st.session_state.dup_queue[0]
+    
+    # Get all unclassified entries for this word
+    positions = st.session_state.word_positions[current_word]
+    word_entries = df.iloc[positions[pd.isna(df['homophone'].array[positions])]]
+    
+    # Display the current word being classified
+    st.header(f"Word: {current_word}")
+    
+    # Display entries in a table format for easier scanning
+    st.subheader(f"Entries containing this word ({len(word_entries)} occurrences):")
+    
+    # Create a display dataframe with just the relevant columns (memoized per file, word and rows)
+    display_df = build_display(
+        word_entries, (st.session_state.file_hash, current_word, word_entries.index.values.tobytes())
+    )
+    
+    # Display the table with wrapped text for better readability
+    st.dataframe(
+        display_df,
+        use_container_width=True,
+        column_config={
+            "Index": st.column_config.TextColumn("Index", width="small"),
+            "Entry": st.column_config.TextColumn("Entry", width="medium"),
+            "Gloss": st.column_config.TextColumn("Gloss", width="large"),
+        },
+        hide_index=True
+    )
+    
+    # Classification section
+    st.subheader("Classification")
+    
+    # Create three buttons for classification options
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        if st.button("Just one word (mark all the same)", 
+                    use_container_width=True,
+                    help="Select this if all occurrences are the same word with the same meaning"):
+            # Mark all with homophone value of 1
+            # (word_entries keeps main_df's index labels, so assign by label)
+            queue_update(word_entries.index.values, 1)
+            
+            # Remove processed word from the queue
+            st.session_state.dup_queue.popleft()
+            st.rerun()
+    
+    with col2:
+        if st.button("More than one word (need to classify)", 
+                    use_container_width=True,
+                    help="Select this if some occurrences have different meanings and need manual classification"):
+            # Toggle homophone classification visibility
+            st.session_state.show_classification = True
+    
+    with col3:
+        if st.button("All different words (mark all as different)", 
+                    use_container_width=True,
+                    help="Select this if each occurrence is a different word/meaning"):
+            # Assign sequential numbers to each occurrence
+            queue_update(word_entries.index.values, np.arange(1, len(word_entries) + 1))
+            
+            # Remove processed word from the queue
+            st.session_state.dup_queue.popleft()
+            st.rerun()
+    
+    # Only show detailed classification if button is clicked
+    if st.session_state.get('show_classification', False):
+        st.markdown("---")
+        st.markdown("### Homophone Group Classification")
+        st.markdown("Assign each entry to a homophone group (entries in the same group have the same meaning)")
+        
+        # Determine how many homophone groups we need
+        homophone_groups = min(5, len(word_entries))
+        
+        # Build the entry labels with vectorized string ops
+        entry_labels = (
+            '#' + word_entries['index'].astype(str) + '-' + word_entries['sub_index'].astype(str)
+            + ': ' + word_entries['gloss'].astype(str).str.slice(0, 50)
+        )
+        
+        # Create a more user-friendly selection interface with radio buttons
+        selection_values = {}
+        for i, entry_label in enumerate(entry_labels):
+            st.markdown(f"**{entry_label}**")
+            
+            # Use radio buttons for mutually exclusive selection
+            selected_group = st.radio(
+                "Select group:",
+                options=list(range(1, homophone_groups + 1)),
+                horizontal=True,
+                key=f"radio_{i}",
+                index=0  # Default to group 1
+            )
+            
+            # Store the selection
+            selection_values[i] = {"group": selected_group}
+            
+            st.markdown("---")
+        
+        if st.button("Save Classification & Continue"):
+            # Process the selections as one buffered update
+            queue_update(word_entries.index.values, [
+                selection_values[i]["group"] for i in range(len(word_entries))
+            ])
+            
+            # Remove processed word from the queue
+            st.session_state.dup_queue.popleft()
+            
+            # Reset classification view
+            st.session_state.show_classification = False
+            st.rerun()
+    
+    # Show progress
+    st.markdown("---")
+    total_words = len(st.session_state.main_df)
+    classified_words = st.session_state.classified_count
+    progress = classified_words / total_words
+    st.progress(progress)
+    st.write(f"Progress: {classified_words}/{total_words} words classified ({progress:.1%})")
+    
+    # Add a skip button for troubleshooting (the callback runs before the panel reruns)
+    st.button("Skip this word", on_click=skip_word)
+
 # File uploader
-uploaded_file = st.file_uploader("Choose an Excel file", type=["xlsx", "xls"])
+uploaded_file = st.file_uploader("Choose an Excel or Parquet file", type=["xlsx", "xls", "parquet"])
 
 if uploaded_file is not None:
     # Load the data
     try:
-        df = pd.read_excel(uploaded_file)
+        # Identify the upload by content so a modified file with the same name still resets state
+        file_hash = xxhash.xxh3_64(uploaded_file.getbuffer()).hexdigest()
         
-        # Check if required columns exist
-        required_columns = ['index', 'sub_index', 'entry', 'gloss', 'word']
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        # Only parse a newly uploaded file; reruns work on main_df directly, since even
+        # a cache hit in load_excel hands back a full copy of the dataframe
+        is_new_file = st.session_state.get('file_hash') != file_hash
+        missing_columns = []
+        if is_new_file:
+            file_bytes = uploaded_file.getvalue()
+            with st.spinner("Loading file..."):
+                df = load_excel(file_bytes)
+            
+            # Check if required columns exist
+            required_columns = ['index', 'sub_index', 'entry', 'gloss', 'word']
+            missing_columns = [col for col in required_columns if col not in df.columns]
         
         if missing_columns:
             st.error(f"Missing required columns: {', '.join(missing_columns)}")
         else:
-            # Initialize or update the main dataframe
-            if 'main_df' not in st.session_state:
-                # First time loading this file
-                st.session_state.main_df = df.copy()
-                
-                # Initialize homophone column if it doesn't exist
-                if 'homophone' not in st.session_state.main_df.columns:
-                    st.session_state.main_df['homophone'] = np.nan
-            else:
-                # If uploading a new file, replace main_df
-                if 'file_name' not in st.session_state or st.session_state.file_name != uploaded_file.name:
-                    st.session_state.main_df = df.copy()
-                    
-                    # Initialize homophone column if it doesn't exist
-                    if 'homophone' not in st.session_state.main_df.columns:
-                        st.session_state.main_df['homophone'] = np.nan
-                    
-                    # Remember the file name
-                    st.session_state.file_name = uploaded_file.name
-            
-            # Use the session state dataframe for all operations
-            df = st.session_state.main_df
+            # Initialize the main dataframe when a new file is uploaded
+            if is_new_file:
+                # Write out any buffered work for the previous file before replacing it
+                if st.session_state.get('pending_updates'):
+                    flush_updates()
+                st.session_state.pending_updates = []
                 
-            # Mark single occurrence words with homophone value of 1
-            word_counts = df['word'].value_counts()
-            single_words = word_counts[word_counts == 1].index
-            df.loc[df['word'].isin(single_words), 'homophone'] = 1
-            
-            # Get only unclassified rows
-            unclassified_df = df[df['homophone'].isna()].copy()
-            
-            # If we're just starting and haven't processed anything yet
-            if 'working_df' not in st.session_state:
-                st.session_state.working_df = unclassified_df.copy()
-            
-            # Check if there are any unclassified rows left
-            if len(st.session_state.working_df) > 0:
-                # Get the first word that needs classification
-                current_word = st.session_state.working_df['word'].iloc[0]
+                # Resume from this reviewer's checkpoint of this exact file if one exists; checkpoints
+                # belong to the token in the page URL, so other sessions on the same file never share them
+                checkpoint_key = f"{file_hash}_{progress_token()}"
+                st.session_state.restored_checkpoint = checkpoint_exists(checkpoint_key)
+                if os.path.exists(checkpoint_path(checkpoint_key)):
+                    df = pd.read_parquet(checkpoint_path(checkpoint_key))
                 
-                # Get all entries for this word
-                word_entries = st.session_state.working_df[st.session_state.working_df['word'] == current_word]
+                # Store words as categorical codes so counting, grouping and matching compare ints, not strings
+                df['word'] = df['word'].astype('category')
                 
-                # Display the current word being classified
-                st.header(f"Word: {current_word}")
+                # load_excel returns a fresh copy on every call, so no .copy() needed
+                st.session_state.main_df = df
                 
-                # Display entries in a table format for easier scanning
-                st.subheader(f"Entries containing this word ({len(word_entries)} occurrences):")
+                # Initialize homophone column if it doesn't exist, as a small nullable integer
+                if 'homophone' not in df.columns:
+                    df['homophone'] = pd.NA
+                df['homophone'] = df['homophone'].astype('Int16')
                 
-                # Create a display dataframe with just the relevant columns
-                display_df = word_entries[['index', 'sub_index', 'entry', 'gloss']].copy()
-                display_df['index'] = display_df['index'].astype(str) + '-' + display_df['sub_index'].astype(str)
-                display_df = display_df.drop('sub_index', axis=1)
-                display_df.columns = ['Index', 'Entry', 'Gloss']
+                # Re-apply classifications that were buffered but not yet in the snapshot
+                if os.path.exists(pending_checkpoint_path(checkpoint_key)):
+                    pending_df = pd.read_parquet(pending_checkpoint_path(checkpoint_key))
+                    df.loc[pending_df['row'].values, 'homophone'] = pending_df['homophone'].values
                 
-                # Display the table with wrapped text for better readability
-                st.dataframe(
-                    display_df,
-                    use_container_width=True,
-                    column_config={
-                        "Index": st.column_config.TextColumn("Index", width="small"),
-                        "Entry": st.column_config.TextColumn("Entry", width="medium"),
-                        "Gloss": st.column_config.TextColumn("Gloss", width="large"),
-                    },
-                    hide_index=True
-                )
+                # Downcast the integer id columns to the smallest type that holds them
+                for col in ['index', 'sub_index']:
+                    if pd.api.types.is_integer_dtype(df[col]):
+                        df[col] = pd.to_numeric(df[col], downcast='integer')
                 
-                # Classification section
-                st.subheader("Classification")
+                # Count occurrences of each row's word in a single grouped pass
+                word_sizes = df.groupby('word', sort=False, observed=True)['word'].transform('size')
                 
-                # Create three buttons for classification options
-                col1, col2, col3 = st.columns(3)
+                # Mark single occurrence words with homophone value of 1 (once per file)
+                df.loc[word_sizes == 1, 'homophone'] = 1
                 
-                with col1:
-                    if st.button("Just one word (mark all the same)", 
-                                use_container_width=True,
-                                help="Select this if all occurrences are the same word with the same meaning"):
-                        # Mark all with homophone value of 1
-                        for idx, row in word_entries.iterrows():
-                            # Update in our main dataframe
-                            st.session_state.main_df.loc[
-                                (st.session_state.main_df['index'] == row['index']) & 
-                                (st.session_state.main_df['sub_index'] == row['sub_index']), 
-                                'homophone'
-                            ] = 1
-                        
-                        # Remove processed words from working dataframe
-                        st.session_state.working_df = st.session_state.working_df[st.session_state.working_df['word'] != current_word]
-                        st.rerun()
+                # Build the queue of duplicated words still awaiting classification once per file
+                pending = df['homophone'].isna() & (word_sizes > 1)
+                st.session_state.dup_queue = deque(df.loc[pending, 'word'].unique())
                 
-                with col2:
-                    if st.button("More than one word (need to classify)", 
-                                use_container_width=True,
-                                help="Select this if some occurrences have different meanings and need manual classification"):
-                        # Toggle homophone classification visibility
-                        st.session_state.show_classification = True
+                # Track progress with a running counter instead of rescanning the column each rerun
+                st.session_state.classified_count = int(df['homophone'].notna().sum())
                 
-                with col3:
-                    if st.button("All different words (mark all as different)", 
-                                use_container_width=True,
-                                help="Select this if each occurrence is a different word/meaning"):
-                        # Assign sequential numbers to each occurrence
-                        for i, (idx, row) in enumerate(word_entries.iterrows(), start=1):
-                            # Update in our main dataframe
-                            st.session_state.main_df.loc[
-                                (st.session_state.main_df['index'] == row['index']) & 
-                                (st.session_state.main_df['sub_index'] == row['sub_index']), 
-                                'homophone'
-                            ] = i
-                        
-                        # Remove processed words from working dataframe
-                        st.session_state.working_df = st.session_state.working_df[st.session_state.working_df['word'] != current_word]
-                        st.rerun()
+                # Map each word to its row positions so lookups avoid scanning the whole column
+                st.session_state.word_positions = df.groupby('word', sort=False, observed=True).indices
                 
-                # Only show detailed classification if button is clicked
-                if st.session_state.get('show_classification', False):
-                    st.markdown("---")
-                    st.markdown("### Homophone Group Classification")
-                    st.markdown("Assign each entry to a homophone group (entries in the same group have the same meaning)")
-                    
-                    # Determine how many homophone groups we need
-                    homophone_groups = min(5, len(word_entries))
-                    
-                    # Create a classification dataframe
-                    classification_df = pd.DataFrame({
-                        'Entry': [f"#{row['index']}-{row['sub_index']}: {row['gloss'][:50]}" 
-                                for _, row in word_entries.iterrows()]
-                    })
-                    
-                    # Create a more user-friendly selection interface with radio buttons
-                    selection_values = {}
-                    for i, (idx, row) in enumerate(word_entries.iterrows()):
-                        st.markdown(f"**{classification_df.loc[i, 'Entry']}**")
-                        
-                        # Use radio buttons for mutually exclusive selection
-                        selected_group = st.radio(
-                            "Select group:",
-                            options=list(range(1, homophone_groups + 1)),
-                            horizontal=True,
-                            key=f"radio_{i}",
-                            index=0  # Default to group 1
-                        )
-                        
-                        # Store the selection
-                        selection_values[i] = {
-                            "index": row['index'],
-                            "sub_index": row['sub_index'],
-                            "group": selected_group
-                        }
-                        
-                        st.markdown("---")
-                    
-                    if st.button("Save Classification & Continue"):
-                        # Process the selections and update the dataframe
-                        for i, selection in selection_values.items():
-                            # Update in our main dataframe
-                            st.session_state.main_df.loc[
-                                (st.session_state.main_df['index'] == selection["index"]) & 
-                                (st.session_state.main_df['sub_index'] == selection["sub_index"]), 
-                                'homophone'
-                            ] = selection["group"]
-                        
-                        # Remove processed words from working dataframe
-                        st.session_state.working_df = st.session_state.working_df[st.session_state.working_df['word'] != current_word]
-                        
-                        # Reset classification view
-                        st.session_state.show_classification = False
-                        st.rerun()
+                st.session_state.show_classification = False
                 
-                # Show progress
-                st.markdown("---")
-                total_unclassified = len(st.session_state.main_df[st.session_state.main_df['homophone'].isna()])
-                total_words = len(st.session_state.main_df)
-                classified_words = total_words - total_unclassified
-                progress = classified_words / total_words
-                st.progress(progress)
-                st.write(f"Progress: {classified_words}/{total_words} words classified ({progress:.1%})")
+                # Remember which file and checkpoint the session state belongs to
+                st.session_state.checkpoint_key = checkpoint_key
+                st.session_state.file_hash = file_hash
+            
+            # Use the session state dataframe for all operations
+            df = st.session_state.main_df
                 
-                # Add a skip button for troubleshooting
-                if st.button("Skip this word"):
-                    # Move this word to the end of the working dataframe
-                    skipped_entries = st.session_state.working_df[st.session_state.working_df['word'] == current_word]
-                    remaining_entries = st.session_state.working_df[st.session_state.working_df['word'] != current_word]
-                    st.session_state.working_df = pd.concat([remaining_entries, skipped_entries])
-                    st.rerun()
+            # Say when saved progress was picked up rather than resuming silently
+            if st.session_state.restored_checkpoint:
+                st.info("Restored your saved progress for this file. Reopen this page's URL to resume it again later.")
+            
+            # Check if there are any duplicated words left to classify
+            if st.session_state.dup_queue:
+                classify_panel()
             
             else:
-                # All words have been classified
+                # All words have been classified; keep the checkpoint until the user discards it
+                flush_updates()
                 st.success("✅ All words have been classified! Download your completed Excel file below.")
             
             # Always show export button at the bottom
             st.markdown("---")
             st.markdown("### Export Database")
             st.markdown("You can export the database at any time. Simply re-upload the database the next time you run this app to continue your work on this data set.")
+            st.markdown("For large databases, the Parquet export is much faster to produce and can be re-uploaded the same way.")
             
-            # Make sure we're using the current state of the dataframe
+            # Saved progress stays on the server until it is explicitly discarded
+            if checkpoint_exists(st.session_state.checkpoint_key):
+                st.button("Discard saved progress and start over", on_click=discard_checkpoint)
+            
+            # Make sure we're using the current state of the dataframe, including buffered classifications;
+            # download callables run on another thread, so they get a snapshot of the only column that changes
             export_df = st.session_state.main_df
+            homophone = homophone_snapshot(export_df, st.session_state.pending_updates)
             
-            st.download_button(
-                label="Export Database",
-                data=to_excel_bytes(export_df),
-                file_name=f"classified_{uploaded_file.name}",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+            export_col1, export_col2 = st.columns(2)
+            
+            # Files are only built when a button is clicked (callable data), not on every rerun
+            with export_col1:
+                st.download_button(
+                    label="Export Database (Parquet)",
+                    data=lambda: to_parquet_bytes(export_frame(export_df, homophone)),
+                    file_name=f"classified_{os.path.splitext(uploaded_file.name)[0]}.parquet",
+                    mime="application/vnd.apache.parquet",
+                    on_click="ignore"
+                )
+            
+            with export_col2:
+                st.download_button(
+                    label="Export Database (Excel)",
+                    data=lambda: to_excel_bytes(export_frame(export_df, homophone)),
+                    file_name=f"classified_{os.path.splitext(uploaded_file.name)[0]}.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    on_click="ignore"
+                )
             
             # Show stats
             total_words = len(df)
-            classified_words = df['homophone'].notna().sum()
+            classified_words = st.session_state.classified_count
             st.markdown(f"**Classification Stats:** {classified_words}/{total_words} words classified ({classified_words/total_words:.1%})")
             
     except Exception as e:
@@ -253,7 +458,7 @@ if uploaded_file is not None:
         st.write("Please check if the file has the required columns: 'index', 'sub_index', 'entry', 'gloss', 'word'")
 else:
     st.info("""
-    Please upload an Excel file to begin.
+    Please upload an Excel or Parquet file to begin.
     
     Expected columns:
     - "index" - original indexing system